@@ -27,7 +27,7 @@ except ImportError:
     from urlparse import urljoin
 
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from .exceptions import KeycloakConnectionError
 
@@ -41,9 +41,18 @@ class ConnectionManager(object):
     :param timeout: (int) Timeout to use for requests to the server.
     :param verify: (bool) Verify server SSL.
     :param proxies: (dict) The proxies servers requests is sent by.
+    :param pool_maxsize: (int) Maximum number of connections kept open to the server.
     """
 
-    def __init__(self, base_url, headers={}, timeout=60, verify=True, proxies=None):
+    def __init__(
+        self,
+        base_url,
+        headers={},
+        timeout=60,
+        verify=True,
+        proxies=None,
+        pool_maxsize=DEFAULT_POOLSIZE,
+    ):
         self._base_url = base_url
         self._headers = headers
         self._timeout = timeout
@@ -54,7 +63,7 @@ class ConnectionManager(object):
         # retry once to reset connection with Keycloak after  tomcat's ConnectionTimeout
         # see https://github.com/marcospereirampj/python-keycloak/issues/36
         for protocol in ("https://", "http://"):
-            adapter = HTTPAdapter(max_retries=1)
+            adapter = HTTPAdapter(max_retries=1, pool_maxsize=pool_maxsize)
             # adds POST to retry whitelist
             allowed_methods = set(adapter.max_retries.allowed_methods)
             allowed_methods.add("POST")
@@ -23,6 +23,11 @@
 
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class KeycloakError(Exception):
     def __init__(self, error_message="", response_code=None, response_body=None):
@@ -88,6 +93,13 @@ class KeycloakInvalidTokenError(KeycloakOperationError):
     pass
 
 
+def _response_json(response):
+    # orjson decodes the large listings (users, groups, server info) noticeably faster
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 def raise_error_from_response(response, error, expected_codes=None, skip_exists=False):
     if expected_codes is None:
         expected_codes = [200, 201, 204]
@@ -97,7 +109,7 @@ def raise_error_from_response(response, error, expected_codes=None, skip_exists=
             return {}
 
         try:
-            return response.json()
+            return _response_json(response)
         except ValueError:
             return response.content
 
@@ -105,7 +117,7 @@ def raise_error_from_response(response, error, expected_codes=None, skip_exists=
         return {"msg": "Already exists"}
 
     try:
-        message = response.json()["message"]
+        message = _response_json(response)["message"]
     except (KeyError, ValueError):
         message = response.content
 
@@ -28,9 +28,12 @@ import json
 from builtins import isinstance
 from typing import Iterable
 
+from requests.adapters import DEFAULT_POOLSIZE
+
 from . import urls_patterns
 from .connection import ConnectionManager
 from .exceptions import (
+    KeycloakAuthenticationError,
     KeycloakDeleteError,
     KeycloakGetError,
     KeycloakPostError,
@@ -57,6 +60,9 @@ class KeycloakAdmin:
     :param user_realm_name: The realm name of the user, if different from realm_name
     :param auto_refresh_token: list of methods that allows automatic token refresh.
         Ex: ['get', 'put', 'post', 'delete']
+    :param token: previously obtained token dict, skips the initial token request
+    :param pool_maxsize: maximum number of connections kept open to the server,
+        raise it when the client is shared by many threads
     """
 
     PAGE_SIZE = 100
@@ -74,6 +80,7 @@ class KeycloakAdmin:
     _token = None
     _custom_headers = None
     _user_realm_name = None
+    _pool_maxsize = None
 
     def __init__(
         self,
@@ -88,6 +95,8 @@ class KeycloakAdmin:
         custom_headers=None,
         user_realm_name=None,
         auto_refresh_token=None,
+        token=None,
+        pool_maxsize=DEFAULT_POOLSIZE,
     ):
         self.server_url = server_url
         self.username = username
@@ -100,9 +109,15 @@ class KeycloakAdmin:
         self.auto_refresh_token = auto_refresh_token or []
         self.user_realm_name = user_realm_name
         self.custom_headers = custom_headers
+        self.pool_maxsize = pool_maxsize
 
         # Get token Admin
-        self.get_token()
+        if token is None:
+            self.get_token()
+        else:
+            self.token = token
+            self._init_openid()
+            self._init_connection()
 
     @property
     def server_url(self):
@@ -204,6 +219,14 @@ class KeycloakAdmin:
     def custom_headers(self, value):
         self._custom_headers = value
 
+    @property
+    def pool_maxsize(self):
+        return self._pool_maxsize
+
+    @pool_maxsize.setter
+    def pool_maxsize(self, value):
+        self._pool_maxsize = value
+
     @auto_refresh_token.setter
     def auto_refresh_token(self, value):
         allowed_methods = {"get", "post", "put", "delete"}
@@ -255,6 +278,22 @@ class KeycloakAdmin:
 
         return raise_error_from_response(self.raw_get(url, **query), KeycloakGetError)
 
+    def __roles_payload(self, roles, error):
+        """Wrap a single role in a list and check that only role representations are sent
+
+        Keycloak resolves the roles of a mapping or composite by their id, so anything else
+        is rejected before a request is made.
+
+        :param roles: roles list or role (use RoleRepresentation)
+        :param error: Keycloak exception raised if a role is not a representation with an id
+
+        :return: List of role representations
+        """
+        payload = roles if isinstance(roles, list) else [roles]
+        if not all(isinstance(role, dict) and role.get("id") for role in payload):
+            raise error(error_message="Expected role representations with an id in roles")
+        return payload
+
     def import_realm(self, payload):
         """
         Import a new realm from a RealmRepresentation. Realm name must be unique.
@@ -292,6 +331,25 @@ class KeycloakAdmin:
         )
         return raise_error_from_response(data_raw, KeycloakPostError)
 
+    def partial_import_realm(self, realm_name, payload):
+        """
+        Import users, clients, groups, roles and identity providers into an existing realm
+        in a single request
+
+        PartialImportRepresentation
+        https://www.keycloak.org/docs-api/18.0/rest-api/index.html#_partialimportrepresentation
+
+        :param realm_name: Realm name (not the realm id)
+        :param payload: PartialImportRepresentation
+        :return: PartialImportResults
+        """
+        params_path = {"realm-name": realm_name}
+        data_raw = self.raw_post(
+            urls_patterns.URL_ADMIN_REALM_PARTIAL_IMPORT.format(**params_path),
+            data=json.dumps(payload),
+        )
+        return raise_error_from_response(data_raw, KeycloakPostError, expected_codes=[200])
+
     def get_realms(self):
         """
         Lists all realms in Keycloak deployment
@@ -1383,7 +1441,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "id": client_role_id, "role-name": role_name}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_CLIENT_ROLES_COMPOSITE_CLIENT_ROLE.format(**params_path),
@@ -1433,7 +1491,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "id": user_id, "client-id": client_id}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_USER_CLIENT_ROLES.format(**params_path),
@@ -1545,7 +1603,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "role-name": role_name}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_REALM_ROLES_COMPOSITE_REALM_ROLE.format(**params_path),
@@ -1562,7 +1620,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakDeleteError)
         params_path = {"realm-name": self.realm_name, "role-name": role_name}
         data_raw = self.raw_delete(
             urls_patterns.URL_ADMIN_REALM_ROLES_COMPOSITE_REALM_ROLE.format(**params_path),
@@ -1593,7 +1651,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "id": user_id}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_USER_REALM_ROLES.format(**params_path),
@@ -1610,7 +1668,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakDeleteError)
         params_path = {"realm-name": self.realm_name, "id": user_id}
         data_raw = self.raw_delete(
             urls_patterns.URL_ADMIN_USER_REALM_ROLES.format(**params_path),
@@ -1663,7 +1721,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "id": group_id}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_GROUPS_REALM_ROLES.format(**params_path),
@@ -1680,7 +1738,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakDeleteError)
         params_path = {"realm-name": self.realm_name, "id": group_id}
         data_raw = self.raw_delete(
             urls_patterns.URL_ADMIN_GROUPS_REALM_ROLES.format(**params_path),
@@ -1709,7 +1767,7 @@ class KeycloakAdmin:
         :return: Keycloak server response
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakPostError)
         params_path = {"realm-name": self.realm_name, "id": group_id, "client-id": client_id}
         data_raw = self.raw_post(
             urls_patterns.URL_ADMIN_GROUPS_CLIENT_ROLES.format(**params_path),
@@ -1740,7 +1798,7 @@ class KeycloakAdmin:
         :return: Keycloak server response (array RoleRepresentation)
         """
 
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakDeleteError)
         params_path = {"realm-name": self.realm_name, "id": group_id, "client-id": client_id}
         data_raw = self.raw_delete(
             urls_patterns.URL_ADMIN_GROUPS_CLIENT_ROLES.format(**params_path),
@@ -1798,7 +1856,7 @@ class KeycloakAdmin:
         :param roles: roles list or role to delete (use RoleRepresentation)
         :return: Keycloak server response
         """
-        payload = roles if isinstance(roles, list) else [roles]
+        payload = self.__roles_payload(roles, KeycloakDeleteError)
         params_path = {"realm-name": self.realm_name, "id": user_id, "client-id": client_id}
         data_raw = self.raw_delete(
             urls_patterns.URL_ADMIN_USER_CLIENT_ROLES.format(**params_path),
@@ -2516,7 +2574,11 @@ class KeycloakAdmin:
             return self.connection.raw_delete(*args, **kwargs)
         return r
 
-    def get_token(self):
+    def _init_openid(self):
+        """Set up the OpenID client used to obtain and refresh the admin token.
+
+        :return: grant type to request the token with
+        """
         if self.user_realm_name:
             token_realm_name = self.user_realm_name
         elif self.realm_name:
@@ -2538,18 +2600,16 @@ class KeycloakAdmin:
             grant_type = ["client_credentials"]
             if self.user_realm_name:
                 self.realm_name = self.user_realm_name
+        return grant_type
 
-        if self.username and self.password:
-            self.token = self.keycloak_openid.token(
-                self.username, self.password, grant_type=grant_type, totp=self.totp
-            )
-
+    def _init_connection(self):
+        """Set up the connection to the server authorized with the current token."""
+        if self.token:
             headers = {
                 "Authorization": "Bearer " + self.token.get("access_token"),
                 "Content-Type": "application/json",
             }
         else:
-            self.token = None
             headers = {}
 
         if self.custom_headers is not None:
@@ -2557,12 +2617,33 @@ class KeycloakAdmin:
             headers.update(self.custom_headers)
 
         self.connection = ConnectionManager(
-            base_url=self.server_url, headers=headers, timeout=60, verify=self.verify
+            base_url=self.server_url,
+            headers=headers,
+            timeout=60,
+            verify=self.verify,
+            pool_maxsize=self.pool_maxsize,
         )
 
+    def get_token(self):
+        grant_type = self._init_openid()
+
+        if self.username and self.password:
+            self.token = self.keycloak_openid.token(
+                self.username, self.password, grant_type=grant_type, totp=self.totp
+            )
+        else:
+            self.token = None
+
+        self._init_connection()
+
     def refresh_token(self):
         refresh_token = self.token.get("refresh_token", None)
         if refresh_token is None:
+            if not (self.username and self.password):
+                # A client built from a token alone has nothing to log in again with
+                raise KeycloakAuthenticationError(
+                    error_message="Token cannot be refreshed: no refresh token and no credentials"
+                )
             self.get_token()
         else:
             try:
@@ -2574,6 +2655,12 @@ class KeycloakAdmin:
                     b"Session not active",
                 ]
                 if e.response_code == 400 and any(err in e.response_body for err in list_errors):
+                    if not (self.username and self.password):
+                        raise KeycloakAuthenticationError(
+                            error_message=e.error_message,
+                            response_code=e.response_code,
+                            response_body=e.response_body,
+                        ) from e
                     self.get_token()
                 else:
                     raise
@@ -128,6 +128,7 @@ URL_ADMIN_REALM_EXPORT = (
     "admin/realms/{realm-name}/partial-export?exportClients={export-clients"
     + "}&exportGroupsAndRoles={export-groups-and-roles}"
 )
+URL_ADMIN_REALM_PARTIAL_IMPORT = "admin/realms/{realm-name}/partialImport"
 
 URL_ADMIN_DEFAULT_DEFAULT_CLIENT_SCOPES = URL_ADMIN_REALM + "/default-default-client-scopes"
 URL_ADMIN_DEFAULT_DEFAULT_CLIENT_SCOPE = URL_ADMIN_DEFAULT_DEFAULT_CLIENT_SCOPES + "/{id}"
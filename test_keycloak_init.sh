@@ -10,6 +10,13 @@ function keycloak_stop() {
     docker rm unittest_keycloak &> /dev/null
 }
 
+function keycloak_running() {
+    # Only reuse a container that is up and was started from the current image
+    [ "$(docker inspect -f '{{.State.Running}}' unittest_keycloak 2> /dev/null)" == "true" ] &&
+    [ "$(docker inspect -f '{{.Image}}' unittest_keycloak)" == \
+      "$(docker image inspect -f '{{.Id}}' "${KEYCLOAK_DOCKER_IMAGE}" 2> /dev/null)" ]
+}
+
 function keycloak_start() {
     echo "Starting keycloak docker container"
     docker run -d --name unittest_keycloak -e KEYCLOAK_ADMIN="${KEYCLOAK_ADMIN}" -e KEYCLOAK_ADMIN_PASSWORD="${KEYCLOAK_ADMIN_PASSWORD}" -p "${KEYCLOAK_PORT}:8080" "${KEYCLOAK_DOCKER_IMAGE}" start-dev
@@ -23,11 +30,21 @@ function keycloak_start() {
     done
 }
 
-# Ensuring that keycloak is stopped in case of CTRL-C
-trap keycloak_stop err exit
-
-keycloak_stop # In case it did not shut down correctly last time.
-keycloak_start
+if [ "${KEYCLOAK_REUSE}" == "1" ]; then
+    # Keep the container around for the next run, the tests clean up their own realms
+    if keycloak_running; then
+        echo "Reusing running keycloak docker container"
+    else
+        keycloak_stop
+        keycloak_start
+    fi
+else
+    # Ensuring that keycloak is stopped in case of CTRL-C
+    trap keycloak_stop err exit
+
+    keycloak_stop # In case it did not shut down correctly last time.
+    keycloak_start
+fi
 
 eval ${CMD_ARGS}
 RETURN_VALUE=$?
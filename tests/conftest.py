@@ -1,61 +1,260 @@
+import hashlib
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 
 import pytest
+from jose import jwt
 
-from keycloak import KeycloakAdmin
+from keycloak import KeycloakAdmin, KeycloakOpenID
+from keycloak.exceptions import KeycloakDeleteError, KeycloakError, KeycloakGetError
 
 
-@pytest.fixture
+@dataclass(frozen=True)
+class KeycloakTestEnv:
+    KEYCLOAK_HOST: Optional[str]
+    KEYCLOAK_PORT: Optional[str]
+    KEYCLOAK_ADMIN: Optional[str]
+    KEYCLOAK_ADMIN_PASSWORD: Optional[str]
+
+
+KEYCLOAK_ENV = KeycloakTestEnv(
+    *(
+        os.environ.get(key)
+        for key in ("KEYCLOAK_HOST", "KEYCLOAK_PORT", "KEYCLOAK_ADMIN", "KEYCLOAK_ADMIN_PASSWORD")
+    )
+)
+
+
+@pytest.fixture(scope="session")
 def env():
-    class KeycloakTestEnv(object):
-        KEYCLOAK_HOST = os.environ["KEYCLOAK_HOST"]
-        KEYCLOAK_PORT = os.environ["KEYCLOAK_PORT"]
-        KEYCLOAK_ADMIN = os.environ["KEYCLOAK_ADMIN"]
-        KEYCLOAK_ADMIN_PASSWORD = os.environ["KEYCLOAK_ADMIN_PASSWORD"]
+    missing = [key for key, value in vars(KEYCLOAK_ENV).items() if value is None]
+    if missing:
+        pytest.fail(
+            "Missing environment variables for the Keycloak test server: " + ", ".join(missing)
+        )
+    return KEYCLOAK_ENV
 
-    return KeycloakTestEnv()
 
+# Refresh the admin token when it expires within this many seconds
+TOKEN_EXPIRY_LEEWAY = 30
 
-@pytest.fixture
-def admin(env):
-    return KeycloakAdmin(
+
+# Reuse the admin token of a previous pytest run for at most this many seconds
+TOKEN_CACHE_TTL = 300
+
+
+@pytest.fixture(scope="session")
+def admin_token(env, request):
+    keycloak_openid = KeycloakOpenID(
+        server_url=f"http://{env.KEYCLOAK_HOST}:{env.KEYCLOAK_PORT}",
+        realm_name="master",
+        client_id="admin-cli",
+    )
+    # A refresh token only outlives the run when the container does (KEYCLOAK_REUSE=1), and
+    # it grants master realm admin access, so don't write it to .pytest_cache otherwise.
+    cache = None
+    if os.environ.get("KEYCLOAK_REUSE") == "1":
+        cache = getattr(request.config, "cache", None)
+    cache_key = (
+        f"keycloak/admin_token/{env.KEYCLOAK_HOST}/{env.KEYCLOAK_PORT}/{env.KEYCLOAK_ADMIN}"
+    )
+
+    token = None
+    cached = cache.get(cache_key, None) if cache is not None else None
+    if (
+        isinstance(cached, dict)
+        and cached.get("refresh_token")
+        and cached.get("expires_at", 0) > time.time()
+    ):
+        # Refreshing is cheaper than a password grant and fails if the server was rebuilt
+        try:
+            token = keycloak_openid.refresh_token(cached["refresh_token"])
+        except KeycloakError:
+            token = None
+    if token is None:
+        token = keycloak_openid.token(env.KEYCLOAK_ADMIN, env.KEYCLOAK_ADMIN_PASSWORD)
+
+    if cache is not None:
+        ttl = min(TOKEN_CACHE_TTL, token.get("refresh_expires_in", 0))
+        cache.set(
+            cache_key,
+            {"refresh_token": token["refresh_token"], "expires_at": time.time() + ttl},
+        )
+    return token
+
+
+@pytest.fixture(scope="session")
+def admin(env, admin_token):
+    # The admin is shared by the whole session, so let it re-authenticate on 401
+    # instead of failing the tests that run after the access token expired.
+    admin = KeycloakAdmin(
         server_url=f"http://{env.KEYCLOAK_HOST}:{env.KEYCLOAK_PORT}",
         username=env.KEYCLOAK_ADMIN,
         password=env.KEYCLOAK_ADMIN_PASSWORD,
+        auto_refresh_token=["get", "put", "post", "delete"],
+        token=admin_token,
     )
+    yield admin
+    admin.connection._s.close()
 
 
-@pytest.fixture
-def realm(admin: KeycloakAdmin) -> str:
-    realm_name = str(uuid.uuid4())
+@pytest.fixture(scope="session")
+def admin_user_id(admin: KeycloakAdmin) -> str:
+    return admin.get_user_id(username=admin.username)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_admin_token(request):
+    """Refresh the shared admin token up front if it is about to expire."""
+    if "admin" not in request.fixturenames:
+        return
+    admin = request.getfixturevalue("admin")
+    claims = jwt.get_unverified_claims(admin.token["access_token"])
+    if claims["exp"] - time.time() < TOKEN_EXPIRY_LEEWAY:
+        admin.refresh_token()
+
+
+@pytest.fixture(autouse=True)
+def _restore_admin_realm(request):
+    """Point the shared admin back at master once a test that used it is done."""
+    if "admin" not in request.fixturenames:
+        yield
+        return
+    admin = request.getfixturevalue("admin")
+    yield
+    admin.realm_name = "master"
+
+
+def _realm_contents(admin: KeycloakAdmin) -> dict:
+    """Names of the entities Keycloak bootstraps a fresh realm with."""
+    return {
+        "clients": {x["clientId"] for x in admin.get_clients()},
+        "roles": {x["name"] for x in admin.get_realm_roles()},
+        "flows": {x["alias"] for x in admin.get_authentication_flows()},
+    }
+
+
+def _reset_realm(admin: KeycloakAdmin, realm_name: str, baseline: dict):
+    """Remove everything a test added to the shared realm."""
+    admin.realm_name = realm_name
+    try:
+        admin.get_realm(realm_name=realm_name)
+    except KeycloakGetError:
+        # The test deleted the realm itself (e.g. import/export), start over
+        admin.create_realm(payload={"realm": realm_name})
+        return
+
+    for client in admin.get_clients():
+        if client["clientId"] not in baseline["clients"]:
+            admin.delete_client(client_id=client["id"])
+    for user in admin.get_users(query={"briefRepresentation": True}):
+        admin.delete_user(user_id=user["id"])
+    for group in admin.get_groups():
+        admin.delete_group(group_id=group["id"])
+    for idp in admin.get_idps():
+        admin.delete_idp(idp_alias=idp["alias"])
+    for role in admin.get_realm_roles():
+        if role["name"] not in baseline["roles"]:
+            admin.delete_realm_role(role_name=role["name"])
+    for flow in admin.get_authentication_flows():
+        if flow["alias"] not in baseline["flows"]:
+            admin.delete_authentication_flow(flow_id=flow["id"])
+
+
+def _new_realm_name(kind: str) -> str:
+    # Each xdist worker runs its own session, keep the realms of the workers apart
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    return f"pytest-{kind}-{worker_id}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="session")
+def new_realm_name():
+    """Build realm names the same way as the conftest realms, for tests creating their own."""
+    return _new_realm_name
+
+
+def _delete_realm(admin: KeycloakAdmin, realm_name: str):
+    try:
+        admin.delete_realm(realm_name=realm_name)
+    except KeycloakDeleteError as e:
+        # Already removed by the test itself
+        if e.response_code != 404:
+            raise
+
+
+@pytest.fixture(scope="session")
+def _cleanup_registry(admin: KeycloakAdmin):
+    """Names of realms to delete concurrently once the session is over."""
+    realm_names = []
+    yield realm_names
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda name: _delete_realm(admin, name), realm_names))
+
+
+@pytest.fixture(scope="session")
+def _shared_realm(admin: KeycloakAdmin, _cleanup_registry: list):
+    realm_name = _new_realm_name("shared")
     admin.create_realm(payload={"realm": realm_name})
+    _cleanup_registry.append(realm_name)
+    admin.realm_name = realm_name
+    baseline = _realm_contents(admin)
+    admin.realm_name = "master"
+    return realm_name, baseline
+
+
+@pytest.fixture
+def realm(admin: KeycloakAdmin, _shared_realm) -> str:
+    realm_name, baseline = _shared_realm
+    admin.realm_name = realm_name
     yield realm_name
-    admin.delete_realm(realm_name=realm_name)
+    _reset_realm(admin, realm_name, baseline)
+
+
+@pytest.fixture
+def realm_isolated(admin: KeycloakAdmin, _cleanup_registry: list) -> str:
+    """A realm of the test's own, for tests that delete it or leave a lot behind."""
+    realm_name = _new_realm_name("isolated")
+    admin.create_realm(payload={"realm": realm_name})
+    _cleanup_registry.append(realm_name)
+    admin.realm_name = realm_name
+    return realm_name
+
+
+@pytest.fixture(scope="session")
+def populated_realm(admin: KeycloakAdmin, _cleanup_registry: list) -> str:
+    """A realm holding more users than fit on one page of the admin API."""
+    realm_name = _new_realm_name("populated")
+    admin.create_realm(payload={"realm": realm_name})
+    _cleanup_registry.append(realm_name)
+    users = [
+        {"username": f"user_{ind}", "email": f"user_{ind}@test.test"}
+        for ind in range(admin.PAGE_SIZE + 50)
+    ]
+    res = admin.partial_import_realm(
+        realm_name=realm_name, payload={"ifResourceExists": "SKIP", "users": users}
+    )
+    assert res["added"] == admin.PAGE_SIZE + 50, res
+    return realm_name
 
 
 @pytest.fixture
-def user(admin: KeycloakAdmin, realm: str) -> str:
-    admin.realm_name = realm
-    username = str(uuid.uuid4())
-    user_id = admin.create_user(payload={"username": username, "email": f"{username}@test.test"})
-    yield user_id
-    admin.delete_user(user_id=user_id)
+def user(admin: KeycloakAdmin, realm: str, request) -> str:
+    prefix = hashlib.sha1(request.node.nodeid.encode()).hexdigest()[:8]
+    username = f"{prefix}-{uuid.uuid4()}"
+    return admin.create_user(payload={"username": username, "email": f"{username}@test.test"})
 
 
 @pytest.fixture
 def group(admin: KeycloakAdmin, realm: str) -> str:
-    admin.realm_name = realm
     group_name = str(uuid.uuid4())
-    group_id = admin.create_group(payload={"name": group_name})
-    yield group_id
-    admin.delete_group(group_id=group_id)
+    return admin.create_group(payload={"name": group_name})
 
 
 @pytest.fixture
 def client(admin: KeycloakAdmin, realm: str) -> str:
-    admin.realm_name = realm
     client = str(uuid.uuid4())
-    client_id = admin.create_client(payload={"name": client, "clientId": client})
-    yield client_id
-    admin.delete_client(client_id=client_id)
+    return admin.create_client(payload={"name": client, "clientId": client})
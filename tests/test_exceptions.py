@@ -0,0 +1,49 @@
+import pytest
+import requests
+
+from keycloak import exceptions
+from keycloak.exceptions import KeycloakGetError, raise_error_from_response
+
+
+def _response(status_code: int, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+@pytest.fixture(params=["orjson", "json"])
+def decoder(request, monkeypatch):
+    """Run the test with and without the optional orjson decoder."""
+    if request.param == "orjson":
+        monkeypatch.setattr(exceptions, "orjson", pytest.importorskip("orjson"))
+    else:
+        monkeypatch.setattr(exceptions, "orjson", None)
+    return request.param
+
+
+def test_raise_error_from_response_decodes_json(decoder):
+    res = raise_error_from_response(
+        _response(200, b'{"id": "x", "roles": [1, 2]}'), KeycloakGetError
+    )
+    assert res == {"id": "x", "roles": [1, 2]}, res
+
+
+def test_raise_error_from_response_empty_body(decoder):
+    res = raise_error_from_response(_response(201, b""), KeycloakGetError)
+    assert res == b"", res
+
+    res = raise_error_from_response(_response(204, b""), KeycloakGetError)
+    assert res == dict(), res
+
+
+def test_raise_error_from_response_errors(decoder):
+    with pytest.raises(KeycloakGetError, match="400: bad request") as err:
+        raise_error_from_response(_response(400, b'{"message": "bad request"}'), KeycloakGetError)
+    assert err.value.response_code == 400
+
+    page = b"<html><body>Bad Gateway</body></html>"
+    with pytest.raises(KeycloakGetError) as err:
+        raise_error_from_response(_response(502, page), KeycloakGetError)
+    assert err.value.error_message == page, err.value.error_message
+    assert err.value.response_body == page, err.value.response_body